@@ -30,7 +30,8 @@ MA_ZIP_TO_CITY = {
 def fix_missing_cities():
     """Fix missing city names for venues."""
     with app.app_context():
-        venues = Venue.query.filter(Venue.city.is_(None)).all()
+        # Stream rows in batches rather than loading the whole table
+        venues = Venue.query.filter(Venue.city.is_(None)).yield_per(200)
         updated_count = 0
         
         for venue in venues:
@@ -10,7 +10,8 @@ from models import db, Venue
 def fix_address_parsing():
     """Fix address parsing for all venues in the database."""
     with app.app_context():
-        venues = Venue.query.all()
+        # Stream rows in batches rather than loading the whole table
+        venues = Venue.query.yield_per(200)
         updated_count = 0
         
         for venue in venues:
@@ -1,6 +1,7 @@
 import os
 import logging
 import click
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, render_template, request, jsonify, flash, redirect, url_for
 from flask_login import login_required, current_user
 from flask_migrate import Migrate, upgrade as db_upgrade
@@ -91,6 +92,11 @@ def create_app(config_class=None):
         config_class = get_config()
     app.config.from_object(config_class)
     
+    # Keep jsonify on the stdlib encoder but skip key sorting and debug-mode
+    # pretty-printing, which dominate encoding time for large search responses
+    app.json.sort_keys = False
+    app.json.compact = True
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -119,6 +125,7 @@ def create_app(config_class=None):
     app.google_api = google_api
     app.venue_search_service = VenueSearchService(google_api)
     app.location_service = LocationService(geocoding_service)
+    app.background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='background')
     
     # Apply pending Alembic migrations (replaces db.create_all() - the
     # migrations directory is the source of truth for schema now). Guarded
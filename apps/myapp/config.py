@@ -47,6 +47,11 @@ class Config:
     DEFAULT_SEARCH_RADIUS_MILES = int(os.environ.get('DEFAULT_SEARCH_RADIUS_MILES', 30))
     MAX_SEARCH_RADIUS_MILES = int(os.environ.get('MAX_SEARCH_RADIUS_MILES', 60))
     CACHE_TIMEOUT_HOURS = int(os.environ.get('CACHE_TIMEOUT_HOURS', 24))
+    CATEGORY_CACHE_SECONDS = int(os.environ.get('CATEGORY_CACHE_SECONDS', 300))
+    LOCATION_CACHE_SECONDS = int(os.environ.get('LOCATION_CACHE_SECONDS', 86400))
+    SEARCH_RESULTS_CACHE_SECONDS = int(os.environ.get('SEARCH_RESULTS_CACHE_SECONDS', 300))
+    CATEGORY_INSIGHTS_CACHE_SECONDS = int(os.environ.get('CATEGORY_INSIGHTS_CACHE_SECONDS', 3600))
+    BACKGROUND_SEARCH_LOGGING = os.environ.get('BACKGROUND_SEARCH_LOGGING', 'True').lower() == 'true'
     
     # Development settings
     BYPASS_AUTH = os.environ.get('BYPASS_AUTH', 'False').lower() == 'true'
@@ -119,8 +124,14 @@ class TestingConfig(Config):
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # in-memory SQLite uses a StaticPool, which takes no pool options
     WTF_CSRF_ENABLED = False
     BYPASS_AUTH = True
+    BACKGROUND_SEARCH_LOGGING = False  # in-memory SQLite is one shared connection
+    CATEGORY_CACHE_SECONDS = 0
+    LOCATION_CACHE_SECONDS = 0
+    SEARCH_RESULTS_CACHE_SECONDS = 0
+    CATEGORY_INSIGHTS_CACHE_SECONDS = 0
 
 # Configuration dictionary
 config = {
@@ -6,8 +6,9 @@ Run with: python test_comprehensive.py
 
 import unittest
 import json
-import tempfile
-import os
+from functools import partial
+from unittest.mock import patch
+from werkzeug.security import generate_password_hash
 from app import create_app
 from models import db
 from models.venue import Venue, VenueCategory
@@ -15,6 +16,9 @@ from models.user import User
 from models.review import UserReview
 from utils.accessibility import AccessibilityFilter
 
+# Fixture users don't need brute-force resistance; skip the 600k-round PBKDF2
+FAST_PASSWORD_HASH = partial(generate_password_hash, method='pbkdf2:sha256:1')
+
 
 class ComprehensiveAppTest(unittest.TestCase):
     """Comprehensive tests to validate all app functionality."""
@@ -35,6 +39,9 @@ class ComprehensiveAppTest(unittest.TestCase):
             def validate_config():
                 return []
         
+        patcher = patch('models.user.generate_password_hash', FAST_PASSWORD_HASH)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         self.app = create_app(TestConfig)
         self.client = self.app.test_client()
         self.ctx = self.app.app_context()
@@ -51,7 +58,7 @@ class ComprehensiveAppTest(unittest.TestCase):
         self.ctx.pop()
 
     def _create_test_data(self):
-        """Create comprehensive test data."""
+        """Create comprehensive test data in a single transaction."""
         # Create test categories
         self.category = VenueCategory(
             name='Test Museums',
@@ -59,12 +66,12 @@ class ComprehensiveAppTest(unittest.TestCase):
             icon_class='fas fa-university',
             search_keywords=['museum', 'gallery']
         )
-        db.session.add(self.category)
         
-        # Create test user (or use existing)
+        # Create test user (or use existing); added with the rest instead of
+        # committing on its own through User.create_user
         self.user = User.query.filter_by(username='testuser').first()
         if not self.user:
-            self.user = User.create_user(
+            self.user = User(
                 username='testuser',
                 email='test@example.com',
                 password='testpass123',
@@ -91,7 +98,7 @@ class ComprehensiveAppTest(unittest.TestCase):
             ramp_access=True,
             accessible_seating=True
         )
-        self.venue1.category_id = self.category.id
+        self.venue1.category = self.category
         
         self.venue2 = Venue(
             name='Limited Access Gallery',
@@ -108,9 +115,10 @@ class ComprehensiveAppTest(unittest.TestCase):
             ramp_access=False,
             accessible_seating=False
         )
-        self.venue2.category_id = self.category.id
+        self.venue2.category = self.category
         
-        db.session.add_all([self.venue1, self.venue2])
+        # One flush batches rows of the same table into a single executemany
+        db.session.add_all([self.category, self.user, self.venue1, self.venue2])
         db.session.commit()
 
     # ========== PAGE LOADING TESTS ==========
@@ -4,47 +4,104 @@ Data Source Validation - Ensures all displayed data comes from real sources, not
 Validates that venue data, accessibility scores, and user data are authentic.
 """
 
+import io
 import sys
 import json
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from app import create_app
-from models import db
-from models.venue import Venue, VenueCategory
-from models.user import User
-from models.review import UserReview, UserFavorite
-from utils.accessibility import AccessibilityFilter
-from utils.google_places import GooglePlacesAPI, VenueSearchService
+
+# App and model imports are deferred to the methods that use them: importing
+# app builds the whole Flask/SQLAlchemy stack, which dominates CLI startup.
+
+
+# Patterns that indicate fake venue data, with the lowercased form
+# precomputed for the case-insensitive name/address checks.
+_SUSPICIOUS_VENUE_PATTERNS = [
+    (pattern, pattern.lower(), reason) for pattern, reason in [
+        ("Test", "Contains 'Test' in name"),
+        ("Example", "Contains 'Example' in name"),
+        ("Sample", "Contains 'Sample' in name"),
+        ("Lorem", "Contains Lorem ipsum text"),
+        ("123 Main St", "Generic test address"),
+        ("555-", "Fake phone number pattern")
+    ]
+]
 
 
 class DataSourceValidator:
     """Validates that all data displayed in the app comes from legitimate sources."""
     
     def __init__(self):
+        from app import create_app
         self.app = create_app()
         self.errors = []
         self.warnings = []
         self.validated_items = []
+        # Validators run concurrently, so the shared result lists need a lock
+        self._lock = threading.Lock()
+        # Per-thread output buffer for the validator section being run
+        self._local = threading.local()
+        self._client = None
+        
+    @property
+    def client(self):
+        """Flask test client, created on first use and reused afterwards."""
+        if self._client is None:
+            self._client = self.app.test_client()
+        return self._client
+        
+    @property
+    def venue_search_service(self):
+        """The app's VenueSearchService, so its GooglePlacesAPI session is reused."""
+        return self.app.venue_search_service
+        
+    def _write(self, line):
+        """Buffer a line of output for the current validator section."""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            print(line)
+        else:
+            buffer.write(line + "\n")
+        
+    def _run_section(self, validate):
+        """Run one validator and write its buffered output in a single call."""
+        self._local.buffer = io.StringIO()
+        try:
+            validate()
+        finally:
+            output = self._local.buffer.getvalue()
+            self._local.buffer = None
+            with self._lock:
+                sys.stdout.write(output)
+                sys.stdout.flush()
         
     def log_error(self, check, message):
         """Log a validation error."""
-        self.errors.append(f"❌ {check}: {message}")
-        print(f"❌ {check}: {message}")
+        with self._lock:
+            self.errors.append(f"❌ {check}: {message}")
+        self._write(f"❌ {check}: {message}")
         
     def log_warning(self, check, message):
         """Log a validation warning."""
-        self.warnings.append(f"⚠️  {check}: {message}")
-        print(f"⚠️  {check}: {message}")
+        with self._lock:
+            self.warnings.append(f"⚠️  {check}: {message}")
+        self._write(f"⚠️  {check}: {message}")
         
     def log_success(self, check):
         """Log a successful validation."""
-        self.validated_items.append(f"✅ {check}")
-        print(f"✅ {check}")
+        with self._lock:
+            self.validated_items.append(f"✅ {check}")
+        self._write(f"✅ {check}")
 
     def validate_venue_data_authenticity(self):
         """Validate that venue data comes from real Google Places API or database."""
-        print("\n🏢 VALIDATING VENUE DATA AUTHENTICITY")
-        print("-" * 50)
+        from models import db
+        from models.venue import Venue
+
+        self._write("\n🏢 VALIDATING VENUE DATA AUTHENTICITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
             venues = Venue.query.limit(10).all()  # Check first 10 venues
@@ -53,37 +110,60 @@ class DataSourceValidator:
                 self.log_warning("Venue data", "No venues in database to validate")
                 return
             
+            # Range-check coordinates for the whole table in one DB-side pass
+            # so only the offending rows are fetched into Python.
+            invalid_coords = db.session.execute(
+                db.select(Venue.id, Venue.latitude, Venue.longitude).where(db.or_(
+                    Venue.latitude < -90, Venue.latitude > 90,
+                    Venue.longitude < -180, Venue.longitude > 180
+                ))
+            ).all()
+            for venue_id, latitude, longitude in invalid_coords:
+                if not (-90 <= latitude <= 90):
+                    self.log_error(f"Venue {venue_id} coordinates", f"Invalid latitude: {latitude}")
+                if not (-180 <= longitude <= 180):
+                    self.log_error(f"Venue {venue_id} coordinates", f"Invalid longitude: {longitude}")
+            invalid_coord_ids = {row.id for row in invalid_coords}
+            
+            # Same for Google Place IDs, which start with ChIJ (substr rather
+            # than LIKE, which SQLite matches case-insensitively)
+            invalid_place_id_ids = {
+                venue_id for (venue_id,) in Venue.query.filter(
+                    Venue.google_place_id.isnot(None),
+                    db.func.substr(Venue.google_place_id, 1, 4) != 'ChIJ'
+                ).with_entities(Venue.id).all()
+            }
+            for venue_id in invalid_place_id_ids:
+                self.log_error(f"Venue {venue_id} Google Place ID", "Invalid Google Place ID format")
+            
             for venue in venues:
                 # Check for suspicious patterns that indicate fake data
-                suspicious_patterns = [
-                    ("Test", "Contains 'Test' in name"),
-                    ("Example", "Contains 'Example' in name"),
-                    ("Sample", "Contains 'Sample' in name"),
-                    ("Lorem", "Contains Lorem ipsum text"),
-                    ("123 Main St", "Generic test address"),
-                    ("555-", "Fake phone number pattern")
-                ]
+                name_lower = (venue.name or "").lower()
+                address_lower = (venue.address or "").lower()
                 
                 venue_suspicious = False
-                for pattern, reason in suspicious_patterns:
-                    if pattern.lower() in (venue.name or "").lower():
+                for pattern, pattern_lower, reason in _SUSPICIOUS_VENUE_PATTERNS:
+                    if pattern_lower in name_lower:
                         self.log_error(f"Venue {venue.id} name", f"Suspicious test data: {reason}")
                         venue_suspicious = True
-                    if pattern.lower() in (venue.address or "").lower():
+                    if pattern_lower in address_lower:
                         self.log_error(f"Venue {venue.id} address", f"Suspicious test data: {reason}")
                         venue_suspicious = True
                     if venue.phone and pattern in venue.phone:
                         self.log_error(f"Venue {venue.id} phone", f"Suspicious test data: {reason}")
                         venue_suspicious = True
                 
+                # Once a venue is flagged, skip the remaining checks (including the
+                # shared-coordinates query). The report only needs pass/fail per
+                # venue; the trade-off is that later issues on an already-flagged
+                # venue are not listed until the first one is fixed.
+                if venue_suspicious:
+                    continue
+                
                 # Validate coordinate ranges (realistic lat/lng)
                 if venue.latitude and venue.longitude:
-                    if not (-90 <= venue.latitude <= 90):
-                        self.log_error(f"Venue {venue.id} coordinates", f"Invalid latitude: {venue.latitude}")
-                        venue_suspicious = True
-                    if not (-180 <= venue.longitude <= 180):
-                        self.log_error(f"Venue {venue.id} coordinates", f"Invalid longitude: {venue.longitude}")
-                        venue_suspicious = True
+                    if venue.id in invalid_coord_ids:
+                        continue  # already reported by the bulk range check
                     
                     # Check for obviously fake coordinates (0,0 or repeated values)
                     if venue.latitude == 0 and venue.longitude == 0:
@@ -98,11 +178,9 @@ class DataSourceValidator:
                     if similar_coords > 2:
                         self.log_warning(f"Venue {venue.id} coordinates", f"{similar_coords} venues share same coordinates")
                 
-                # Validate Google Places integration
-                if hasattr(venue, 'google_place_id') and venue.google_place_id:
-                    if not venue.google_place_id.startswith('ChIJ'):  # Google Place IDs start with ChIJ
-                        self.log_error(f"Venue {venue.id} Google Place ID", "Invalid Google Place ID format")
-                        venue_suspicious = True
+                # Validate Google Places integration (reported by the bulk check above)
+                if venue.id in invalid_place_id_ids:
+                    continue
                 
                 # Check for realistic accessibility features
                 accessibility_features = [
@@ -125,13 +203,15 @@ class DataSourceValidator:
                 else:
                     self.log_warning(f"Venue {venue.id} accessibility", "No accessibility data available")
                 
-                if not venue_suspicious:
-                    self.log_success(f"Venue {venue.id} ({venue.name[:30]}...)")
+                self.log_success(f"Venue {venue.id} ({venue.name[:30]}...)")
 
     def validate_accessibility_scores(self):
         """Validate that accessibility scores are calculated from real data, not hardcoded."""
-        print("\n♿ VALIDATING ACCESSIBILITY SCORE CALCULATIONS")
-        print("-" * 50)
+        from models.venue import Venue
+        from utils.accessibility import AccessibilityFilter
+
+        self._write("\n♿ VALIDATING ACCESSIBILITY SCORE CALCULATIONS")
+        self._write("-" * 50)
         
         with self.app.app_context():
             venues = Venue.query.limit(5).all()
@@ -179,8 +259,10 @@ class DataSourceValidator:
 
     def validate_user_data_authenticity(self):
         """Validate that user data is realistic and not obviously fake."""
-        print("\n👤 VALIDATING USER DATA AUTHENTICITY")
-        print("-" * 50)
+        from models.user import User
+
+        self._write("\n👤 VALIDATING USER DATA AUTHENTICITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
             users = User.query.limit(10).all()
@@ -220,8 +302,11 @@ class DataSourceValidator:
 
     def validate_review_data_authenticity(self):
         """Validate that reviews are realistic and not obviously generated."""
-        print("\n⭐ VALIDATING REVIEW DATA AUTHENTICITY")
-        print("-" * 50)
+        from models import db
+        from models.review import UserReview
+
+        self._write("\n⭐ VALIDATING REVIEW DATA AUTHENTICITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
             reviews = UserReview.query.limit(10).all()
@@ -230,6 +315,18 @@ class DataSourceValidator:
                 self.log_warning("Review data", "No reviews in database to validate")
                 return
             
+            # Range-check ratings DB-side so only out-of-range reviews come back
+            invalid_ratings = db.session.execute(
+                db.select(UserReview.id, UserReview.overall_rating, UserReview.accessibility_rating).where(db.or_(
+                    UserReview.overall_rating < 1, UserReview.overall_rating > 5,
+                    UserReview.accessibility_rating < 1, UserReview.accessibility_rating > 5
+                ))
+            ).all()
+            for review_id, overall_rating, accessibility_rating in invalid_ratings:
+                self.log_error(f"Review {review_id}",
+                               f"Invalid rating: overall={overall_rating}, accessibility={accessibility_rating}")
+            invalid_rating_ids = {row.id for row in invalid_ratings}
+            
             for review in reviews:
                 # Check for fake review patterns
                 suspicious_phrases = [
@@ -244,9 +341,8 @@ class DataSourceValidator:
                             self.log_error(f"Review {review.id}", f"Suspicious comment: contains '{phrase}'")
                             review_suspicious = True
                 
-                # Validate rating range
-                if not 1 <= review.rating <= 5:
-                    self.log_error(f"Review {review.id}", f"Invalid rating: {review.rating}")
+                # Rating range was validated in bulk above
+                if review.id in invalid_rating_ids:
                     review_suspicious = True
                 
                 # Check for realistic timestamp
@@ -259,21 +355,18 @@ class DataSourceValidator:
                     self.log_warning(f"Review {review.id}", "Very old review (>10 years)")
                 
                 if not review_suspicious:
-                    self.log_success(f"Review {review.id} (Rating: {review.rating})")
+                    self.log_success(f"Review {review.id} (Rating: {review.overall_rating})")
 
     def validate_search_results_authenticity(self):
         """Validate that search results come from real API calls, not static data."""
-        print("\n🔍 VALIDATING SEARCH RESULT AUTHENTICITY")
-        print("-" * 50)
+        self._write("\n🔍 VALIDATING SEARCH RESULT AUTHENTICITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
             # Test if Google Places API is actually being called
             try:
-                google_api = GooglePlacesAPI(self.app.config.get('GOOGLE_PLACES_API_KEY'))
-                venue_service = VenueSearchService(google_api)
-                
                 # Try a search and validate response structure
-                test_venues = venue_service.search_venues(
+                test_venues = self.venue_search_service.search_venues(
                     latitude=40.7128, longitude=-74.0060, radius_miles=1, category=None
                 )
                 
@@ -298,8 +391,13 @@ class DataSourceValidator:
 
     def validate_database_integrity(self):
         """Check for data consistency and referential integrity."""
-        print("\n🗄️  VALIDATING DATABASE INTEGRITY")
-        print("-" * 50)
+        from models import db
+        from models.venue import Venue
+        from models.user import User
+        from models.review import UserReview
+
+        self._write("\n🗄️  VALIDATING DATABASE INTEGRITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
             # Check for orphaned records
@@ -333,11 +431,13 @@ class DataSourceValidator:
 
     def validate_api_responses(self):
         """Test actual API endpoints to ensure they return real data."""
-        print("\n🌐 VALIDATING API RESPONSE AUTHENTICITY")
-        print("-" * 50)
+        from models.venue import Venue
+
+        self._write("\n🌐 VALIDATING API RESPONSE AUTHENTICITY")
+        self._write("-" * 50)
         
         with self.app.app_context():
-            client = self.app.test_client()
+            client = self.client
             
             # Test venue detail API
             venue = Venue.query.first()
@@ -365,13 +465,22 @@ class DataSourceValidator:
         print("🔍 DATA SOURCE VALIDATION STARTING")
         print("=" * 60)
         
-        self.validate_venue_data_authenticity()
-        self.validate_accessibility_scores()
-        self.validate_user_data_authenticity()
-        self.validate_review_data_authenticity()
-        self.validate_search_results_authenticity()
-        self.validate_database_integrity()
-        self.validate_api_responses()
+        validators = [
+            self.validate_venue_data_authenticity,
+            self.validate_accessibility_scores,
+            self.validate_user_data_authenticity,
+            self.validate_review_data_authenticity,
+            self.validate_search_results_authenticity,
+            self.validate_database_integrity,
+            self.validate_api_responses,
+        ]
+        
+        # The validators are dominated by DB round-trips and one Google API
+        # call, so overlap them. Each one pushes its own app context, which
+        # gives it its own scoped SQLAlchemy session, and buffers its output
+        # so sections are written whole rather than interleaved.
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(self._run_section, validators))
         
         self.print_summary()
 
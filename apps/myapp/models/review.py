@@ -1,5 +1,7 @@
 from datetime import datetime, timedelta
+from sqlalchemy import event
 from . import db
+from utils.cache import clear_app_cache
 from utils.database import DatabaseCompatArray, DatabaseCompatJSON
 
 class UserFavorite(db.Model):
@@ -168,6 +170,13 @@ class UserReview(db.Model):
     def __repr__(self):
         return f'<UserReview user_id={self.user_id} venue_id={self.venue_id}>'
 
+def _clear_review_caches(mapper, connection, target):
+    """Drop cached category insights, which include review ratings, whenever a review is written."""
+    clear_app_cache('category_insights')
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(UserReview, _event_name, _clear_review_caches)
+
 class SearchHistory(db.Model):
     """Search history for improving recommendations and analytics."""
     
@@ -219,6 +228,28 @@ class SearchHistory(db.Model):
         db.session.commit()
         return search
     
+    @staticmethod
+    def log_search_in_background(**kwargs):
+        """Queue log_search() on the app's background executor.
+        
+        The request returns without waiting on the INSERT/commit. Runs inline
+        when BACKGROUND_SEARCH_LOGGING is off (e.g. in-memory SQLite tests).
+        """
+        from flask import current_app
+        
+        app = current_app._get_current_object()
+        if not app.config.get('BACKGROUND_SEARCH_LOGGING'):
+            return SearchHistory.log_search(**kwargs)
+        
+        def _log():
+            with app.app_context():
+                try:
+                    SearchHistory.log_search(**kwargs)
+                except Exception as e:
+                    app.logger.warning(f"Failed to log search history: {e}")
+        
+        return app.background_executor.submit(_log)
+    
     @staticmethod
     def get_popular_searches(days=30, limit=10):
         """Get popular search patterns from the last N days."""
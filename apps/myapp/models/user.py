@@ -68,7 +68,10 @@ class User(UserMixin, db.Model):
     def is_venue_favorited(self, venue_id):
         """Check if a venue is favorited by this user."""
         from .review import UserFavorite
-        return UserFavorite.query.filter_by(user_id=self.id, venue_id=venue_id).first() is not None
+        
+        return db.session.query(
+            UserFavorite.query.filter_by(user_id=self.id, venue_id=venue_id).exists()
+        ).scalar()
     
     def get_venue_review(self, venue_id):
         """Get this user's review for a specific venue."""
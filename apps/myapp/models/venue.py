@@ -1,8 +1,32 @@
 from datetime import datetime
-from math import radians, cos
+from functools import lru_cache
+from math import radians, cos, sin, asin, sqrt
+from flask import g, has_app_context
+from sqlalchemy import event
 from . import db
+from utils.cache import get_app_cache, clear_app_cache
 from utils.database import DatabaseCompatArray
 
+# Boolean accessibility columns and their display labels, in bitmask order
+ACCESSIBILITY_FEATURES = (
+    ('wheelchair_accessible', "Wheelchair Accessible"),
+    ('accessible_parking', "Accessible Parking"),
+    ('accessible_restroom', "Accessible Restroom"),
+    ('elevator_access', "Elevator Access"),
+    ('wide_doorways', "Wide Doorways"),
+    ('ramp_access', "Ramp Access"),
+    ('accessible_seating', "Accessible Seating"),
+)
+
+@lru_cache(maxsize=1 << len(ACCESSIBILITY_FEATURES))
+def _features_for_bits(bits):
+    """Labels for a Venue.accessibility_bits value (every bit pattern fits in the cache)."""
+    return tuple(label for i, (_, label) in enumerate(ACCESSIBILITY_FEATURES) if bits >> i & 1)
+
+# Venue hours columns indexed by datetime.weekday()
+DAY_NAMES = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+DAY_ATTRS = tuple(f"hours_{day}" for day in DAY_NAMES)
+
 class VenueCategory(db.Model):
     """Venue category model for organizing venues by type."""
     
@@ -16,7 +40,7 @@ class VenueCategory(db.Model):
     search_keywords = db.Column(DatabaseCompatArray())  # Keywords for API searches
     
     # Relationships
-    venues = db.relationship('Venue', backref='category', lazy='dynamic')
+    venues = db.relationship('Venue', back_populates='category', lazy='dynamic')
     
     def __init__(self, name, description=None, icon_class=None, search_keywords=None):
         """Initialize a new venue category."""
@@ -25,13 +49,67 @@ class VenueCategory(db.Model):
         self.icon_class = icon_class
         self.search_keywords = search_keywords or []
     
+    @staticmethod
+    def get_all():
+        """Get all categories, cached in-process for CATEGORY_CACHE_SECONDS.
+        
+        The cache holds detached instances; each call merges them into the
+        current session without a query, so they behave like loaded rows.
+        """
+        cache = get_app_cache('venue_categories', 'CATEGORY_CACHE_SECONDS')
+        categories = cache.get('all')
+        if categories is None:
+            categories = VenueCategory.query.all()
+            for category in categories:
+                db.session.expunge(category)
+            cache.set('all', categories)
+        return [db.session.merge(category, load=False) for category in categories]
+    
+    @staticmethod
+    def get_summaries():
+        """Get (id, name, description, icon_class) rows for every category.
+        
+        Plain rows rather than ORM objects, for pages that only display
+        categories; the cached list is shared as-is, with no per-request merge.
+        """
+        cache = get_app_cache('venue_categories', 'CATEGORY_CACHE_SECONDS')
+        summaries = cache.get('summaries')
+        if summaries is None:
+            summaries = db.session.execute(
+                db.select(VenueCategory.id, VenueCategory.name,
+                          VenueCategory.description, VenueCategory.icon_class)
+            ).all()
+            cache.set('summaries', summaries)
+        return summaries
+    
+    @staticmethod
+    def get_venue_counts():
+        """Get {category_id: (venues, accessible venues)} for every category.
+        
+        Computed with one grouped query and kept on flask.g for the rest of
+        the request, since to_dict() is called for many categories and venues.
+        """
+        counts = g.get('_venue_category_counts') if has_app_context() else None
+        if counts is None:
+            counts = {
+                category_id: (total, int(accessible or 0))
+                for category_id, total, accessible in db.session.query(
+                    Venue.category_id,
+                    db.func.count(Venue.id),
+                    db.func.sum(db.case((Venue.wheelchair_accessible == True, 1), else_=0))
+                ).group_by(Venue.category_id)
+            }
+            if has_app_context():
+                g._venue_category_counts = counts
+        return counts
+    
     def get_venues_count(self):
         """Get the number of venues in this category."""
-        return self.venues.count()
+        return VenueCategory.get_venue_counts().get(self.id, (0, 0))[0]
     
     def get_accessible_venues_count(self):
         """Get the number of wheelchair accessible venues in this category."""
-        return self.venues.filter_by(wheelchair_accessible=True).count()
+        return VenueCategory.get_venue_counts().get(self.id, (0, 0))[1]
     
     def to_dict(self):
         """Convert category to dictionary for JSON serialization."""
@@ -48,6 +126,13 @@ class VenueCategory(db.Model):
     def __repr__(self):
         return f'<VenueCategory {self.name}>'
 
+def _clear_category_cache(mapper, connection, target):
+    """Drop the cached category list whenever a category is written."""
+    clear_app_cache('venue_categories')
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(VenueCategory, _event_name, _clear_category_cache)
+
 class Venue(db.Model):
     """Venue model for storing venue information and accessibility details."""
     
@@ -62,8 +147,8 @@ class Venue(db.Model):
     zip_code = db.Column(db.String(10))
     phone = db.Column(db.String(20))
     website = db.Column(db.String(500))
-    latitude = db.Column(db.Numeric(10, 8), index=True)
-    longitude = db.Column(db.Numeric(11, 8), index=True)
+    latitude = db.Column(db.Float, index=True)
+    longitude = db.Column(db.Float, index=True)
     category_id = db.Column(db.Integer, db.ForeignKey('venue_categories.id'))
     google_rating = db.Column(db.Numeric(2, 1))
     price_level = db.Column(db.Integer)  # 0-4 scale from Google
@@ -100,8 +185,11 @@ class Venue(db.Model):
     photo_urls = db.Column(DatabaseCompatArray())
     
     # Relationships
-    favorites = db.relationship('UserFavorite', backref='venue', lazy='dynamic', cascade='all, delete-orphan')
-    reviews = db.relationship('UserReview', backref='venue', lazy='dynamic', cascade='all, delete-orphan')
+    category = db.relationship('VenueCategory', back_populates='venues')
+    # Plain lists rather than lazy='dynamic' so they can be eager-loaded;
+    # reviews are read in full by the accessibility scoring for every result
+    favorites = db.relationship('UserFavorite', backref='venue', lazy='select', cascade='all, delete-orphan')
+    reviews = db.relationship('UserReview', backref='venue', lazy='selectin', cascade='all, delete-orphan')
     
     def __init__(self, name, address, latitude=None, longitude=None, **kwargs):
         """Initialize a new venue."""
@@ -127,19 +215,19 @@ class Venue(db.Model):
             parts.append(self.zip_code)
         return ', '.join(parts)
     
+    @property
+    def accessibility_bits(self):
+        """Pack the accessibility feature flags into one int (bit i = ACCESSIBILITY_FEATURES[i])."""
+        bits = 0
+        for i, (attr, _) in enumerate(ACCESSIBILITY_FEATURES):
+            if getattr(self, attr):
+                bits |= 1 << i
+        return bits
+    
     @property
     def accessibility_score(self):
         """Calculate an accessibility score based on available features."""
-        features = [
-            self.wheelchair_accessible,
-            self.accessible_parking,
-            self.accessible_restroom,
-            self.elevator_access,
-            self.wide_doorways,
-            self.ramp_access,
-            self.accessible_seating
-        ]
-        return round((sum(1 for feature in features if feature) / len(features)) * 100, 2)
+        return round((self.accessibility_bits.bit_count() / len(ACCESSIBILITY_FEATURES)) * 100, 2)
     
     def _get_comprehensive_accessibility_score(self):
         """Get comprehensive accessibility score with proper rounding."""
@@ -149,22 +237,7 @@ class Venue(db.Model):
     @property
     def accessibility_features_list(self):
         """Get a list of available accessibility features."""
-        features = []
-        if self.wheelchair_accessible:
-            features.append("Wheelchair Accessible")
-        if self.accessible_parking:
-            features.append("Accessible Parking")
-        if self.accessible_restroom:
-            features.append("Accessible Restroom")
-        if self.elevator_access:
-            features.append("Elevator Access")
-        if self.wide_doorways:
-            features.append("Wide Doorways")
-        if self.ramp_access:
-            features.append("Ramp Access")
-        if self.accessible_seating:
-            features.append("Accessible Seating")
-        return features
+        return list(_features_for_bits(self.accessibility_bits))
     
     def get_hours_for_day(self, day_name):
         """Get operating hours for a specific day."""
@@ -173,54 +246,90 @@ class Venue(db.Model):
     
     def get_all_hours(self):
         """Get all operating hours as a dictionary."""
-        days = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
-        return {day: self.get_hours_for_day(day) for day in days}
-    
-    def is_open_today(self):
-        """Check if the venue is open today (basic implementation)."""
-        from datetime import datetime
-        today = datetime.now().strftime('%A').lower()
-        hours = self.get_hours_for_day(today)
+        return {day: getattr(self, attr) for day, attr in zip(DAY_NAMES, DAY_ATTRS)}
+    
+    def is_open_today(self, today_attr=None):
+        """Check if the venue is open today (basic implementation).
+        
+        today_attr is the hours column for today (see DAY_ATTRS); callers
+        serializing many venues can look it up once and pass it in.
+        """
+        if today_attr is None:
+            today_attr = DAY_ATTRS[datetime.now().weekday()]
+        hours = getattr(self, today_attr)
         return hours and hours.lower() not in ['closed', 'close']
     
+    def get_review_stats(self):
+        """Get (average overall rating, average accessibility rating, review count).
+        
+        Computed from the reviews list, which is selectin-loaded with the
+        venue, so no further query is needed.
+        """
+        reviews = self.reviews
+        overall = [review.overall_rating for review in reviews if review.overall_rating is not None]
+        accessibility = [review.accessibility_rating for review in reviews
+                         if review.accessibility_rating is not None]
+        return (sum(overall) / len(overall) if overall else None,
+                sum(accessibility) / len(accessibility) if accessibility else None,
+                len(reviews))
+    
+    @staticmethod
+    def preload_favorites_counts(venues):
+        """Attach favorite counts to a batch of venues.
+        
+        Runs one grouped query instead of a COUNT per venue when the venues
+        are serialized with to_dict().
+        """
+        from .review import UserFavorite
+        venue_ids = [venue.id for venue in venues if venue.id is not None]
+        if not venue_ids:
+            return venues
+        
+        favorites_counts = dict(db.session.query(
+            UserFavorite.venue_id, db.func.count(UserFavorite.id)
+        ).filter(UserFavorite.venue_id.in_(venue_ids)).group_by(UserFavorite.venue_id).all())
+        
+        for venue in venues:
+            venue._favorites_count = favorites_counts.get(venue.id, 0)
+        return venues
+    
     def get_average_rating(self):
         """Get the average user rating for this venue."""
-        if self.reviews.count() == 0:
-            return self.google_rating
-        
-        user_ratings = [review.overall_rating for review in self.reviews if review.overall_rating]
-        if not user_ratings:
+        avg_overall, _, _ = self.get_review_stats()
+        if avg_overall is None:
             return self.google_rating
-        
-        return sum(user_ratings) / len(user_ratings)
+        return avg_overall
     
     def get_average_accessibility_rating(self):
         """Get the average accessibility rating from user reviews."""
-        accessibility_ratings = [review.accessibility_rating for review in self.reviews 
-                               if review.accessibility_rating]
-        if not accessibility_ratings:
-            return None
-        
-        return sum(accessibility_ratings) / len(accessibility_ratings)
+        _, avg_accessibility, _ = self.get_review_stats()
+        return avg_accessibility
     
     def get_user_reviews_count(self):
         """Get the number of user reviews for this venue."""
-        return self.reviews.count()
+        _, _, count = self.get_review_stats()
+        return count
     
     def get_favorites_count(self):
         """Get the number of users who have favorited this venue."""
-        return self.favorites.count()
+        count = self.__dict__.get('_favorites_count')
+        if count is None:
+            from .review import UserFavorite
+            count = UserFavorite.query.filter_by(venue_id=self.id).count()
+        return count
     
     def distance_from(self, latitude, longitude):
         """Calculate distance from given coordinates (in miles)."""
+        cached = self.__dict__.get('_distance')
+        if cached is not None and cached[0] == (latitude, longitude):
+            return cached[1]
+        
         if not self.latitude or not self.longitude:
             return None
         
-        from math import radians, cos, sin, asin, sqrt
-        
         # Convert decimal degrees to radians
-        lat1, lon1, lat2, lon2 = map(radians, [float(self.latitude), float(self.longitude), 
-                                              latitude, longitude])
+        lat1, lon1 = radians(self.latitude), radians(self.longitude)
+        lat2, lon2 = radians(latitude), radians(longitude)
         
         # Haversine formula
         dlat = lat2 - lat1
@@ -232,8 +341,35 @@ class Venue(db.Model):
         r = 3956
         return c * r
     
-    def to_dict(self, user_latitude=None, user_longitude=None):
-        """Convert venue to dictionary for JSON serialization."""
+    @staticmethod
+    def preload_distances(venues, latitude, longitude):
+        """Compute distances from one point for a batch of venues.
+        
+        The origin terms are computed once and each result is cached on the
+        venue, so sorting, to_dict() and templates don't redo the math.
+        """
+        lat2, lon2 = radians(latitude), radians(longitude)
+        cos_lat2 = cos(lat2)
+        for venue in venues:
+            if not venue.latitude or not venue.longitude:
+                distance = None
+            else:
+                lat1, lon1 = radians(venue.latitude), radians(venue.longitude)
+                a = sin((lat2 - lat1)/2)**2 + cos(lat1) * cos_lat2 * sin((lon2 - lon1)/2)**2
+                distance = 2 * asin(sqrt(a)) * 3956
+            venue._distance = ((latitude, longitude), distance)
+        return venues
+    
+    def to_dict(self, user_latitude=None, user_longitude=None, accessibility_score=None,
+                today_attr=None):
+        """Convert venue to dictionary for JSON serialization.
+        
+        Pass accessibility_score when the caller has already computed it, to
+        skip recomputing the review-weighted score, and today_attr (see
+        is_open_today) when serializing a batch.
+        """
+        if accessibility_score is None:
+            accessibility_score = self._get_comprehensive_accessibility_score()
         data = {
             'id': self.id,
             'google_place_id': self.google_place_id,
@@ -245,8 +381,8 @@ class Venue(db.Model):
             'zip_code': self.zip_code,
             'phone': self.phone,
             'website': self.website,
-            'latitude': float(self.latitude) if self.latitude else None,
-            'longitude': float(self.longitude) if self.longitude else None,
+            'latitude': self.latitude if self.latitude else None,
+            'longitude': self.longitude if self.longitude else None,
             'category': self.category.to_dict() if self.category else None,
             'google_rating': float(self.google_rating) if self.google_rating else None,
             'price_level': self.price_level,
@@ -258,11 +394,11 @@ class Venue(db.Model):
             'ramp_access': self.ramp_access,
             'accessible_seating': self.accessible_seating,
             'accessibility_notes': self.accessibility_notes,
-            'accessibility_score': self._get_comprehensive_accessibility_score(),
+            'accessibility_score': accessibility_score,
             'accessibility_features': self.accessibility_features_list,
             'hours': self.get_all_hours(),
             'seasonal_hours': self.seasonal_hours,
-            'is_open_today': self.is_open_today(),
+            'is_open_today': self.is_open_today(today_attr),
             'verified_accessible': self.verified_accessible,
             'photo_urls': self.photo_urls or [],
             'average_rating': self.get_average_rating(),
@@ -542,3 +678,11 @@ class Venue(db.Model):
     
     def __repr__(self):
         return f'<Venue {self.name}>'
+
+def _clear_venue_search_cache(mapper, connection, target):
+    """Drop cached search results and category insights whenever a venue is written."""
+    clear_app_cache('venue_searches')
+    clear_app_cache('category_insights')
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(Venue, _event_name, _clear_venue_search_cache)
@@ -1,17 +1,27 @@
+from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, current_app
 from flask_login import login_required, current_user
+from sqlalchemy import text
+from sqlalchemy.orm import joinedload
 from models import db
-from models.venue import Venue, VenueCategory
+from models.venue import Venue, VenueCategory, DAY_ATTRS
 from models.review import UserFavorite, UserReview, SearchHistory, ApiCache
 from utils.accessibility import AccessibilityFilter, AccessibilityRecommendations
 
 api_bp = Blueprint('api', __name__)
 
+# Slow-changing responses are cached in ApiCache for a few minutes; clear them
+# early with POST /api/cache/clear {"pattern": "api_response:"}
+RESPONSE_CACHE_TTL_HOURS = 5 / 60
+POPULAR_SEARCHES_CACHE_KEY = 'api_response:popular_searches'
+DB_HEALTH_CHECK_INTERVAL = timedelta(seconds=10)
+
 def get_current_user():
     """Get current user, handling bypass auth mode."""
-    if current_app.config.get('BYPASS_AUTH') and not current_user.is_authenticated:
+    config = current_app.config
+    if config.get('BYPASS_AUTH') and not current_user.is_authenticated:
         from models.user import User
-        return User.query.get(current_app.config.get('DEFAULT_USER_ID', 1))
+        return User.query.get(config.get('DEFAULT_USER_ID', 1))
     return current_user if current_user.is_authenticated else None
 
 @api_bp.route('/search')
@@ -27,10 +37,11 @@ def api_search():
         return jsonify({'error': 'ZIP code is required'}), 400
     
     # Validate and get coordinates
-    coordinates = current_app.location_service.get_search_coordinates(
+    app = current_app._get_current_object()
+    coordinates = app.location_service.get_search_coordinates(
         zip_code=zip_code,
-        default_lat=current_app.config.get('DEFAULT_LATITUDE'),
-        default_lon=current_app.config.get('DEFAULT_LONGITUDE')
+        default_lat=app.config.get('DEFAULT_LATITUDE'),
+        default_lon=app.config.get('DEFAULT_LONGITUDE')
     )
     
     if not coordinates:
@@ -40,7 +51,7 @@ def api_search():
     
     try:
         # Search for venues
-        venues = current_app.venue_search_service.search_venues(
+        venues = app.venue_search_service.search_venues(
             latitude=latitude,
             longitude=longitude,
             radius_miles=radius,
@@ -51,17 +62,24 @@ def api_search():
         # Limit results
         venues = venues[:limit]
         
+        # Fetch favorite counts for the whole page at once
+        Venue.preload_favorites_counts(venues)
+        
         # Convert to JSON
+        today_attr = DAY_ATTRS[datetime.now().weekday()]
         venues_data = []
         for venue in venues:
-            venue_data = venue.to_dict(latitude, longitude)
-            venue_data['accessibility_score'] = AccessibilityFilter.calculate_accessibility_score(venue)
+            venue_data = venue.to_dict(
+                latitude, longitude,
+                accessibility_score=AccessibilityFilter.calculate_accessibility_score(venue),
+                today_attr=today_attr
+            )
             venues_data.append(venue_data)
         
-        # Log search for analytics
+        # Log search for analytics (off the request path)
         user = get_current_user()
         if user:
-            SearchHistory.log_search(
+            SearchHistory.log_search_in_background(
                 user_id=user.id,
                 search_zip=zip_code,
                 search_radius=radius,
@@ -85,15 +103,17 @@ def api_search():
         })
         
     except Exception as e:
-        current_app.logger.error(f"API search error: {e}")
+        app.logger.error(f"API search error: {e}")
         return jsonify({'error': 'Search failed'}), 500
 
 @api_bp.route('/venue/<int:venue_id>')
 def api_venue_detail(venue_id):
     """API endpoint for venue details."""
-    venue = current_app.venue_search_service.get_venue_details(venue_id)
-    if not venue:
+    user = get_current_user()
+    details = current_app.venue_search_service.get_venue_details(venue_id, user.id if user else None)
+    if not details:
         return jsonify({'error': 'Venue not found'}), 404
+    venue = details['venue']
     
     # Get accessibility summary
     accessibility_summary = AccessibilityFilter.get_accessibility_summary(venue)
@@ -103,19 +123,12 @@ def api_venue_detail(venue_id):
     
     # Get similar venues
     similar_venues = AccessibilityRecommendations.suggest_similar_accessible_venues(venue, 3)
+    Venue.preload_favorites_counts([venue] + similar_venues)
     
-    # Check if user has favorited this venue
-    user = get_current_user()
-    is_favorited = False
-    user_review = None
-    
-    if user:
-        is_favorited = user.is_venue_favorited(venue_id)
-        user_review_obj = user.get_venue_review(venue_id)
-        user_review = user_review_obj.to_dict() if user_review_obj else None
-    
-    # Get recent reviews
-    recent_reviews = UserReview.get_venue_reviews(venue_id, 5)
+    # User favorite/review state and recent reviews come from the same load
+    is_favorited = details['is_favorited']
+    user_review = details['user_review'].to_dict() if details['user_review'] else None
+    recent_reviews = details['recent_reviews']
     
     venue_data = venue.to_dict()
     venue_data.update({
@@ -135,13 +148,17 @@ def api_venue_detail(venue_id):
 @api_bp.route('/categories')
 def api_categories():
     """API endpoint for venue categories."""
-    categories = VenueCategory.query.all()
+    # get_all() is cached in-process and cleared whenever a category changes
+    categories = VenueCategory.get_all()
+    
+    insights = AccessibilityRecommendations.get_category_accessibility_insights_bulk(
+        [category.id for category in categories]
+    )
     
     categories_data = []
     for category in categories:
         category_data = category.to_dict()
-        insights = AccessibilityRecommendations.get_category_accessibility_insights(category.id)
-        category_data['insights'] = insights
+        category_data['insights'] = insights.get(category.id, {})
         categories_data.append(category_data)
     
     return jsonify({
@@ -157,8 +174,10 @@ def api_favorites():
     if not user:
         return jsonify({'error': 'Authentication required'}), 401
     
-    favorites = UserFavorite.query.filter_by(user_id=user.id)\
+    favorites = UserFavorite.query.options(joinedload(UserFavorite.venue).joinedload(Venue.category))\
+                                 .filter_by(user_id=user.id)\
                                  .order_by(UserFavorite.created_at.desc()).all()
+    Venue.preload_favorites_counts([favorite.venue for favorite in favorites if favorite.venue])
     
     favorites_data = [favorite.to_dict() for favorite in favorites]
     
@@ -258,8 +277,7 @@ def api_add_review():
     if not venue_id:
         return jsonify({'error': 'Venue ID is required'}), 400
     
-    venue = Venue.query.get(venue_id)
-    if not venue:
+    if not db.session.query(Venue.query.filter_by(id=venue_id).exists()).scalar():
         return jsonify({'error': 'Venue not found'}), 404
     
     # Check for existing review
@@ -359,26 +377,35 @@ def api_search_history():
 def api_popular_searches():
     """API endpoint for popular searches."""
     try:
+        cached = ApiCache.get_cached_data(POPULAR_SEARCHES_CACHE_KEY)
+        if cached is not None:
+            return jsonify(cached)
+        
         popular_searches = SearchHistory.get_popular_searches(days=30, limit=10)
         
+        # Resolve all category names in one query
+        category_ids = {category_filter for _, category_filter, _ in popular_searches if category_filter}
+        category_names = dict(
+            db.session.query(VenueCategory.id, VenueCategory.name)
+                      .filter(VenueCategory.id.in_(category_ids)).all()
+        ) if category_ids else {}
+        
         searches_data = []
         for search_zip, category_filter, search_count in popular_searches:
-            category_name = None
-            if category_filter:
-                category = VenueCategory.query.get(category_filter)
-                category_name = category.name if category else None
-            
             searches_data.append({
                 'zip_code': search_zip,
                 'category_id': category_filter,
-                'category_name': category_name,
+                'category_name': category_names.get(category_filter),
                 'search_count': search_count
             })
         
-        return jsonify({
+        response_data = {
             'success': True,
             'popular_searches': searches_data
-        })
+        }
+        ApiCache.set_cached_data(POPULAR_SEARCHES_CACHE_KEY, response_data,
+                                 ttl_hours=RESPONSE_CACHE_TTL_HOURS)
+        return jsonify(response_data)
         
     except Exception as e:
         current_app.logger.error(f"API popular searches error: {e}")
@@ -413,23 +440,30 @@ def api_clear_cache():
 @api_bp.route('/health')
 def api_health():
     """API health check endpoint."""
+    app = current_app._get_current_object()
     try:
-        # Test database connection
-        db.session.execute('SELECT 1')
+        # Test database connection, at most once per DB_HEALTH_CHECK_INTERVAL
+        # so frequent liveness probes don't each hold a pooled connection
+        db_health = app.extensions.setdefault('db_health', {'checked_at': None})
+        now = datetime.utcnow()
+        if db_health['checked_at'] is None or now - db_health['checked_at'] > DB_HEALTH_CHECK_INTERVAL:
+            db_health['checked_at'] = None
+            db.session.execute(text('SELECT 1'))
+            db_health['checked_at'] = now
         
         # Test Google API key
-        google_api_configured = bool(current_app.config.get('GOOGLE_PLACES_API_KEY'))
+        google_api_configured = bool(app.config.get('GOOGLE_PLACES_API_KEY'))
         
         return jsonify({
             'success': True,
             'status': 'healthy',
             'database': 'connected',
             'google_api': 'configured' if google_api_configured else 'not configured',
-            'app_name': current_app.config.get('APP_NAME', 'Accessible Outings Finder')
+            'app_name': app.config.get('APP_NAME', 'Accessible Outings Finder')
         })
         
     except Exception as e:
-        current_app.logger.error(f"Health check error: {e}")
+        app.logger.error(f"Health check error: {e}")
         return jsonify({
             'success': False,
             'status': 'unhealthy',
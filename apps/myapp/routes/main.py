@@ -1,16 +1,28 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, jsonify, abort
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app, jsonify, abort, make_response, session
 from flask_login import login_required, current_user
 from functools import wraps
 from datetime import date, datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload, lazyload, load_only
 from models import db
 from models.venue import Venue, VenueCategory
 from models.event import Event, EventFavorite, EventReview
 from models.review import UserFavorite, UserReview, SearchHistory
 from models.user import User
 from utils.accessibility import AccessibilityFilter, AccessibilityRecommendations
+from utils.cache import clear_app_cache
 
 main_bp = Blueprint('main', __name__)
 
+# Admin venue lists only show a few columns and the category name; skip the
+# text/array columns and the reviews that Venue otherwise loads
+ADMIN_VENUE_LIST_OPTIONS = (
+    load_only(Venue.id, Venue.name, Venue.city, Venue.state, Venue.category_id,
+              Venue.interestingness_score, Venue.last_updated),
+    joinedload(Venue.category),
+    lazyload(Venue.reviews),
+)
+
 def get_current_user():
     """Get current user, handling bypass auth mode."""
     if current_app.config.get('BYPASS_AUTH') and not current_user.is_authenticated:
@@ -18,10 +30,37 @@ def get_current_user():
         return User.query.get(current_app.config.get('DEFAULT_USER_ID', 1))
     return current_user if current_user.is_authenticated else None
 
+def cached_response(max_age=300):
+    """Decorator to let browsers and proxies reuse a page for max_age seconds.
+    
+    Only anonymous pages with no pending flash messages are marked public;
+    anything personalized is private and revalidated. Either way an ETag
+    lets a repeat request get a 304 instead of the page body.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            personalized = (current_user.is_authenticated or current_app.config.get('BYPASS_AUTH')
+                            or '_flashes' in session)
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                if personalized:
+                    response.cache_control.private = True
+                    response.cache_control.no_cache = True
+                else:
+                    response.cache_control.public = True
+                    response.cache_control.max_age = max_age
+                response.add_etag()
+                response.make_conditional(request)
+            return response
+        return decorated_function
+    return decorator
+
 @main_bp.route('/')
+@cached_response()
 def index():
     """Home page with event search form."""
-    categories = VenueCategory.query.all()
+    categories = VenueCategory.get_all()
     
     # Get user's home ZIP code if available
     user = get_current_user()
@@ -67,6 +106,11 @@ def search():
         flash('Please provide a ZIP code to search.', 'error')
         return redirect(url_for('main.index'))
     
+    # Reject malformed ZIP codes before any geocoding or database work
+    if not current_app.location_service.geocoding.validate_zip_code(zip_code):
+        flash('Invalid ZIP code format.', 'error')
+        return redirect(url_for('main.index'))
+    
     # Handle date filtering
     start_date = None
     end_date = None
@@ -142,7 +186,7 @@ def search():
         user = get_current_user()
         if user and hasattr(user, 'id') and user.id:
             try:
-                SearchHistory.log_search(
+                SearchHistory.log_search_in_background(
                     user_id=user.id,
                     search_zip=zip_code,
                     search_radius=radius,
@@ -219,7 +263,9 @@ def event_detail(event_id):
     user_review = None
     
     if user:
-        is_favorited = EventFavorite.query.filter_by(user_id=user.id, event_id=event_id).first() is not None
+        is_favorited = db.session.query(
+            EventFavorite.query.filter_by(user_id=user.id, event_id=event_id).exists()
+        ).scalar()
         user_review = EventReview.query.filter_by(user_id=user.id, event_id=event_id).first()
     
     # Get recent reviews
@@ -254,10 +300,12 @@ def event_detail(event_id):
 @main_bp.route('/venue/<int:venue_id>')
 def venue_detail(venue_id):
     """Venue detail page."""
-    venue = current_app.venue_search_service.get_venue_details(venue_id)
-    if not venue:
+    user = get_current_user()
+    details = current_app.venue_search_service.get_venue_details(venue_id, user.id if user else None)
+    if not details:
         flash('Venue not found.', 'error')
         return redirect(url_for('main.index'))
+    venue = details['venue']
     
     # Get accessibility summary
     accessibility_summary = AccessibilityFilter.get_accessibility_summary(venue)
@@ -268,17 +316,10 @@ def venue_detail(venue_id):
     # Get similar venues
     similar_venues = AccessibilityRecommendations.suggest_similar_accessible_venues(venue, 3)
     
-    # Check if user has favorited this venue
-    user = get_current_user()
-    is_favorited = False
-    user_review = None
-    
-    if user:
-        is_favorited = user.is_venue_favorited(venue_id)
-        user_review = user.get_venue_review(venue_id)
-    
-    # Get recent reviews
-    recent_reviews = UserReview.get_venue_reviews(venue_id, 5)
+    # User favorite/review state and recent reviews come from the same load
+    is_favorited = details['is_favorited']
+    user_review = details['user_review']
+    recent_reviews = details['recent_reviews']
     
     # Get reason for inclusion
     reason_for_inclusion = venue.get_reason_for_inclusion()
@@ -302,11 +343,34 @@ def favorites():
         flash('Please log in to view favorites.', 'error')
         return redirect(url_for('auth.login'))
     
-    favorites = UserFavorite.query.filter_by(user_id=user.id)\
+    favorites = UserFavorite.query.options(joinedload(UserFavorite.venue))\
+                                 .filter_by(user_id=user.id)\
                                  .order_by(UserFavorite.created_at.desc()).all()
     
     return render_template('favorites.html', favorites=favorites)
 
+def get_json_object():
+    """Parse the request body as a JSON object; {} if missing, invalid or not an object."""
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        payload = {}
+    return payload
+
+def get_json_int(payload, key):
+    """Read an integer field from a parsed JSON body; None if missing or not an integer.
+    
+    Accepts JSON integers and digit strings only, so true/false and floats
+    such as 1.9 aren't coerced into an id.
+    """
+    value = payload.get(key)
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isascii() and value.isdigit():
+        return int(value)
+    return None
+
 @main_bp.route('/add-favorite', methods=['POST'])
 @login_required
 def add_favorite():
@@ -315,14 +379,16 @@ def add_favorite():
     if not user:
         return jsonify({'success': False, 'message': 'Please log in to add favorites.'})
     
-    venue_id = request.json.get('venue_id')
-    notes = request.json.get('notes', '')
-    rating = request.json.get('rating')
+    payload = get_json_object()
+    venue_id = get_json_int(payload, 'venue_id')
+    notes = payload.get('notes', '')
+    rating = get_json_int(payload, 'rating')
     
     if not venue_id:
-        return jsonify({'success': False, 'message': 'Venue ID is required.'})
+        return jsonify({'success': False, 'message': 'Venue ID is required.'}), 400
     
-    venue = Venue.query.get(venue_id)
+    # Only the name is needed for the reply
+    venue = db.session.query(Venue.id, Venue.name).filter_by(id=venue_id).first()
     if not venue:
         return jsonify({'success': False, 'message': 'Venue not found.'})
     
@@ -352,10 +418,11 @@ def remove_favorite():
     if not user:
         return jsonify({'success': False, 'message': 'Please log in to remove favorites.'})
     
-    venue_id = request.json.get('venue_id')
+    payload = get_json_object()
+    venue_id = get_json_int(payload, 'venue_id')
     
     if not venue_id:
-        return jsonify({'success': False, 'message': 'Venue ID is required.'})
+        return jsonify({'success': False, 'message': 'Venue ID is required.'}), 400
     
     try:
         success = UserFavorite.remove_favorite(user.id, venue_id)
@@ -384,7 +451,7 @@ def add_review(venue_id):
         flash('Please log in to add reviews.', 'error')
         return redirect(url_for('auth.login'))
     
-    venue = Venue.query.get(venue_id)
+    venue = Venue.query.options(load_only(Venue.id, Venue.name), lazyload(Venue.reviews)).get(venue_id)
     if not venue:
         flash('Venue not found.', 'error')
         return redirect(url_for('main.index'))
@@ -393,49 +460,34 @@ def add_review(venue_id):
     existing_review = UserReview.query.filter_by(user_id=user.id, venue_id=venue_id).first()
     
     if request.method == 'POST':
-        visit_date = request.form.get('visit_date')
-        overall_rating = request.form.get('overall_rating', type=int)
-        accessibility_rating = request.form.get('accessibility_rating', type=int)
-        review_text = request.form.get('review_text')
-        accessibility_notes = request.form.get('accessibility_notes')
-        would_return = request.form.get('would_return') == 'on'
-        recommended_for_wheelchair = request.form.get('recommended_for_wheelchair') == 'on'
-        weather_conditions = request.form.get('weather_conditions')
-        visit_duration_hours = request.form.get('visit_duration_hours', type=float)
-        companion_count = request.form.get('companion_count', type=int)
+        review_data = {
+            'visit_date': request.form.get('visit_date'),
+            'overall_rating': request.form.get('overall_rating', type=int),
+            'accessibility_rating': request.form.get('accessibility_rating', type=int),
+            'review_text': request.form.get('review_text'),
+            'accessibility_notes': request.form.get('accessibility_notes'),
+            'would_return': request.form.get('would_return') == 'on',
+            'recommended_for_wheelchair': request.form.get('recommended_for_wheelchair') == 'on',
+            'weather_conditions': request.form.get('weather_conditions'),
+            'visit_duration_hours': request.form.get('visit_duration_hours', type=float),
+            'companion_count': request.form.get('companion_count', type=int)
+        }
         
         try:
             if existing_review:
-                # Update existing review
-                existing_review.visit_date = visit_date
-                existing_review.overall_rating = overall_rating
-                existing_review.accessibility_rating = accessibility_rating
-                existing_review.review_text = review_text
-                existing_review.accessibility_notes = accessibility_notes
-                existing_review.would_return = would_return
-                existing_review.recommended_for_wheelchair = recommended_for_wheelchair
-                existing_review.weather_conditions = weather_conditions
-                existing_review.visit_duration_hours = visit_duration_hours
-                existing_review.companion_count = companion_count
-                
+                # Update existing review with one UPDATE statement
+                db.session.execute(
+                    update(UserReview)
+                    .where(UserReview.id == existing_review.id)
+                    .values(**review_data)
+                )
                 db.session.commit()
+                # A bulk UPDATE skips the UserReview mapper events
+                clear_app_cache('category_insights')
                 flash('Review updated successfully!', 'success')
             else:
                 # Create new review
-                review = UserReview(
-                    user_id=user.id,
-                    venue_id=venue_id,
-                    visit_date=visit_date,
-                    overall_rating=overall_rating,
-                    accessibility_rating=accessibility_rating,
-                    review_text=review_text,
-                    accessibility_notes=accessibility_notes,
-                    would_return=would_return,
-                    recommended_for_wheelchair=recommended_for_wheelchair,
-                    weather_conditions=weather_conditions,
-                    visit_duration_hours=visit_duration_hours,
-                    companion_count=companion_count
-                )
+                review = UserReview(user_id=user.id, venue_id=venue_id, **review_data)
                 
                 db.session.add(review)
                 db.session.commit()
@@ -464,15 +516,15 @@ def my_reviews():
     return render_template('my_reviews.html', reviews=reviews)
 
 @main_bp.route('/categories')
+@cached_response()
 def categories():
     """Browse venues by category."""
-    categories = VenueCategory.query.all()
+    categories = VenueCategory.get_summaries()
     
     # Get category insights
-    category_insights = {}
-    for category in categories:
-        insights = AccessibilityRecommendations.get_category_accessibility_insights(category.id)
-        category_insights[category.id] = insights
+    category_insights = AccessibilityRecommendations.get_category_accessibility_insights_bulk(
+        [category.id for category in categories]
+    )
     
     return render_template('categories.html', 
                          categories=categories,
@@ -492,8 +544,8 @@ def category_venues(category_id):
     # Sort by accessibility score
     venues = AccessibilityFilter.sort_by_accessibility(venues)
     
-    # Get category insights
-    insights = AccessibilityRecommendations.get_category_accessibility_insights(category_id)
+    # Get category insights from the venues already loaded
+    insights = AccessibilityRecommendations.get_category_accessibility_insights(category_id, venues)
     
     return render_template('category_venues.html',
                          category=category,
@@ -501,11 +553,13 @@ def category_venues(category_id):
                          insights=insights)
 
 @main_bp.route('/about')
+@cached_response()
 def about():
     """About page."""
     return render_template('about.html')
 
 @main_bp.route('/accessibility-guide')
+@cached_response()
 def accessibility_guide():
     """Accessibility guide page."""
     return render_template('accessibility_guide.html')
@@ -553,7 +607,7 @@ def admin():
             })
     
     # Get top venues by interestingness
-    top_interesting_venues = Venue.query.filter(
+    top_interesting_venues = Venue.query.options(*ADMIN_VENUE_LIST_OPTIONS).filter(
         Venue.interestingness_score.isnot(None)
     ).order_by(Venue.interestingness_score.desc()).limit(10).all()
     
@@ -651,7 +705,8 @@ def admin_staleness():
             buckets['total'] = total
             category_stats.append(buckets)
 
-    most_stale = Venue.query.order_by(Venue.last_updated.asc()).limit(15).all()
+    most_stale = Venue.query.options(*ADMIN_VENUE_LIST_OPTIONS)\
+                            .order_by(Venue.last_updated.asc()).limit(15).all()
 
     return render_template('admin_staleness.html',
                          overall=overall,
@@ -1,14 +1,45 @@
 import unittest
-from app import app, db
-from models.venue import VenueCategory
+from contextlib import contextmanager
+from datetime import datetime
+from functools import partial
+from unittest.mock import patch
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from app import create_app, db
+from config import TestingConfig
+from models.venue import Venue, VenueCategory
+from models.review import UserFavorite, UserReview
 from models.user import User
 
+
+# Fixture users don't need brute-force resistance; skip the 600k-round PBKDF2
+FAST_PASSWORD_HASH = partial(generate_password_hash, method='pbkdf2:sha256:1')
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect the SQL statements executed on engine inside the block."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
 class AppTestCase(unittest.TestCase):
     def setUp(self):
-        app.config['TESTING'] = True
-        app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
-        self.app = app.test_client()
-        self.ctx = app.app_context()
+        patcher = patch('models.user.generate_password_hash', FAST_PASSWORD_HASH)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The URI has to be set before the engine is created, so build a
+        # fresh app per test rather than reconfiguring the module-level one
+        self.flask_app = create_app(TestingConfig)
+        self.app = self.flask_app.test_client()
+        self.ctx = self.flask_app.app_context()
         self.ctx.push()
         db.create_all()
 
@@ -25,7 +56,7 @@ class AppTestCase(unittest.TestCase):
     def test_categories_initialized(self):
         """Test that categories are initialized in the database."""
         from app import _initialize_database
-        _initialize_database(app)
+        _initialize_database(self.flask_app)
         categories = VenueCategory.query.all()
         self.assertGreaterEqual(len(categories), 1)
         names = [cat.name for cat in categories]
@@ -99,5 +130,108 @@ class AppTestCase(unittest.TestCase):
             db.session.commit()
         db.session.rollback()
 
+    # Query-count guards: these fail if a route starts issuing a query per
+    # venue/review/favorite again
+
+    def _create_venues(self, count, user=None):
+        """Create venues in one category, each reviewed and favorited by user."""
+        category = VenueCategory(name="Query Count Category", icon_class="fas fa-star")
+        db.session.add(category)
+        db.session.flush()
+        venues = []
+        for i in range(count):
+            venue = Venue(name=f"Venue {i}", address="1 Main St", google_place_id=f"query-count-{i}",
+                          category_id=category.id, latitude=43.2 + i * 0.01, longitude=-71.5,
+                          wheelchair_accessible=bool(i % 2), last_updated=datetime.utcnow())
+            db.session.add(venue)
+            venues.append(venue)
+        db.session.flush()
+        if user:
+            for venue in venues:
+                db.session.add(UserReview(user.id, venue.id, overall_rating=4, accessibility_rating=3))
+                db.session.add(UserFavorite(user.id, venue.id))
+        db.session.commit()
+        return venues
+
+    def _create_user(self):
+        """Create and commit a user for the query-count tests."""
+        user = User.create_user(username="queryuser", email="query@example.com", password="testpass")
+        db.session.commit()
+        return user
+
+    def _login(self, user):
+        """Log user in on the test client's session."""
+        with self.app.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+
+    def test_categories_queries(self):
+        """Test that the categories page doesn't query per category."""
+        self._create_venues(5)
+        with count_queries(db.engine) as queries:
+            response = self.app.get("/categories")
+        self.assertEqual(response.status_code, 200)
+        # +1 for the BYPASS_AUTH user loaded on every request
+        self.assertLessEqual(len(queries), 5)
+
+    def test_venue_detail_queries(self):
+        """Test that the venue detail API loads reviews and similar venues in batches."""
+        user = self._create_user()
+        venue_id = self._create_venues(5, user)[0].id
+        self._login(user)
+        db.session.expire_all()
+        with count_queries(db.engine) as queries:
+            response = self.app.get(f"/api/venue/{venue_id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()['venue']['is_favorited'])
+        self.assertLessEqual(len(queries), 8)
+
+    def test_favorites_queries(self):
+        """Test that listing favorites doesn't query per favorite."""
+        user = self._create_user()
+        self._create_venues(5, user)
+        self._login(user)
+        db.session.expire_all()
+        with count_queries(db.engine) as queries:
+            response = self.app.get("/api/favorites")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()['favorites']), 5)
+        self.assertLessEqual(len(queries), 6)
+
+    def test_category_insights_refresh_after_review(self):
+        """Test that cached category insights drop when a review is written."""
+        from utils.accessibility import AccessibilityRecommendations
+        self.flask_app.config['CATEGORY_INSIGHTS_CACHE_SECONDS'] = 300
+        venues = self._create_venues(2)
+        category_id = venues[0].category_id
+        before = AccessibilityRecommendations.get_category_accessibility_insights_bulk([category_id])
+        user = self._create_user()
+        for venue in venues:
+            db.session.add(UserReview(user.id, venue.id, overall_rating=5, accessibility_rating=5))
+        db.session.commit()
+        after = AccessibilityRecommendations.get_category_accessibility_insights_bulk([category_id])
+        self.assertNotEqual(before[category_id]['average_score'], after[category_id]['average_score'])
+
+    def test_favorite_non_object_json(self):
+        """Test that a JSON body that isn't an object is rejected rather than erroring."""
+        self._login(self._create_user())
+        for url in ("/add-favorite", "/remove-favorite"):
+            for body in ("[1]", '"x"', "3"):
+                response = self.app.post(url, data=body, content_type="application/json")
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+
+    def test_favorite_rejects_non_integer_venue_id(self):
+        """Test that booleans, floats and non-digit strings aren't coerced into a venue id."""
+        user = self._create_user()
+        self._create_venues(1)
+        self._login(user)
+        for url in ("/add-favorite", "/remove-favorite"):
+            for venue_id in (True, False, 1.9, "1.9", "abc", None):
+                response = self.app.post(url, json={"venue_id": venue_id})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.get_json()['success'])
+        self.assertEqual(UserFavorite.query.count(), 0)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -61,7 +61,7 @@ class AccessibilityFilter:
     @classmethod
     def _calculate_review_accessibility_score(cls, venue: Venue) -> Optional[float]:
         """Calculate accessibility score based on user reviews."""
-        reviews = venue.reviews.all()
+        reviews = list(venue.reviews)
         if not reviews:
             return None
         
@@ -138,7 +138,7 @@ class AccessibilityFilter:
         features = venue.accessibility_features_list
         
         # Get user feedback
-        reviews = venue.reviews.all()
+        reviews = list(venue.reviews)
         user_ratings = [r.accessibility_rating for r in reviews if r.accessibility_rating]
         recommended_count = sum(1 for r in reviews if r.recommended_for_wheelchair)
         
@@ -192,7 +192,7 @@ class AccessibilityRecommendations:
             recommendations.append("Look for ramp or elevator access if there are steps")
         
         # Check user reviews for common issues
-        reviews = venue.reviews.all()
+        reviews = list(venue.reviews)
         common_issues = cls._analyze_common_accessibility_issues(reviews)
         
         for issue in common_issues:
@@ -226,15 +226,58 @@ class AccessibilityRecommendations:
         return issues
     
     @classmethod
-    def get_category_accessibility_insights(cls, category_id: int) -> Dict:
-        """Get accessibility insights for a venue category."""
+    def get_category_accessibility_insights(cls, category_id: int,
+                                           venues: Optional[List[Venue]] = None) -> Dict:
+        """Get accessibility insights for a venue category.
+        
+        Pass venues when the caller has already loaded the category's venues.
+        """
         from models.venue import VenueCategory, Venue
         
         category = VenueCategory.query.get(category_id)
         if not category:
             return {}
         
-        venues = category.venues.all()
+        if venues is None:
+            venues = category.venues.all()
+        return cls._build_category_insights(category, venues)
+    
+    @classmethod
+    def get_category_accessibility_insights_bulk(cls, category_ids: List[int]) -> Dict[int, Dict]:
+        """Get accessibility insights for several categories, keyed by category id.
+        
+        Loads the categories and all of their venues in one pass instead of
+        one round of queries per category. Results are kept in-process for
+        CATEGORY_INSIGHTS_CACHE_SECONDS and dropped whenever a venue or review changes.
+        """
+        from models.venue import VenueCategory, Venue
+        from utils.cache import get_app_cache
+        
+        cache = get_app_cache('category_insights', 'CATEGORY_INSIGHTS_CACHE_SECONDS')
+        insights = {}
+        missing_ids = []
+        for category_id in category_ids:
+            cached = cache.get(category_id)
+            if cached is None:
+                missing_ids.append(category_id)
+            else:
+                insights[category_id] = cached
+        if not missing_ids:
+            return insights
+        
+        categories = VenueCategory.query.filter(VenueCategory.id.in_(missing_ids)).all()
+        venues_by_category = {category.id: [] for category in categories}
+        for venue in Venue.query.filter(Venue.category_id.in_(missing_ids)).all():
+            venues_by_category[venue.category_id].append(venue)
+        
+        for category in categories:
+            insights[category.id] = cls._build_category_insights(category, venues_by_category[category.id])
+            cache.set(category.id, insights[category.id])
+        return insights
+    
+    @classmethod
+    def _build_category_insights(cls, category, venues) -> Dict:
+        """Summarize a category's venues for get_category_accessibility_insights."""
         if not venues:
             return {'category': category.name, 'venue_count': 0}
         
@@ -284,10 +327,7 @@ class AccessibilityRecommendations:
         nearby_venues = []
         for similar_venue in similar_venues:
             if similar_venue.latitude and similar_venue.longitude:
-                distance = venue.distance_from(
-                    float(similar_venue.latitude), 
-                    float(similar_venue.longitude)
-                )
+                distance = venue.distance_from(similar_venue.latitude, similar_venue.longitude)
                 if distance and distance <= 50:
                     nearby_venues.append(similar_venue)
         
@@ -295,10 +335,7 @@ class AccessibilityRecommendations:
         scored_venues = []
         for similar_venue in nearby_venues:
             score = AccessibilityFilter.calculate_accessibility_score(similar_venue)
-            distance = venue.distance_from(
-                float(similar_venue.latitude), 
-                float(similar_venue.longitude)
-            )
+            distance = venue.distance_from(similar_venue.latitude, similar_venue.longitude)
             # Combined score: 70% accessibility, 30% proximity (inverted)
             combined_score = (score * 0.7) + ((50 - distance) / 50 * 0.3)
             scored_venues.append((similar_venue, combined_score))
@@ -369,7 +406,7 @@ class AccessibilityValidator:
         suggestions = []
         
         # Check user reviews for accessibility information
-        reviews = venue.reviews.all()
+        reviews = list(venue.reviews)
         accessibility_mentions = []
         
         for review in reviews:
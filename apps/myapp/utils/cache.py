@@ -0,0 +1,75 @@
+"""Small in-process caches for data that changes rarely."""
+
+import hashlib
+import threading
+import time
+
+from flask import current_app, has_app_context
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after ttl_seconds."""
+
+    def __init__(self, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get a cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        """Cache a value for ttl_seconds (a TTL of 0 disables caching)."""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def delete(self, key):
+        """Drop a cached value."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Drop every cached value."""
+        with self._lock:
+            self._data.clear()
+
+
+def get_app_cache(name, ttl_config_key, default_ttl=300):
+    """Get the current app's TTLCache called name, creating it on first use.
+
+    Caches live in app.extensions so apps with different databases (e.g. in
+    tests) never share entries.
+    """
+    caches = current_app.extensions.setdefault('ttl_caches', {})
+    cache = caches.get(name)
+    if cache is None:
+        cache = caches.setdefault(name, TTLCache(current_app.config.get(ttl_config_key, default_ttl)))
+    return cache
+
+
+def clear_app_cache(name):
+    """Clear the current app's TTLCache called name, if there is one."""
+    if has_app_context():
+        cache = current_app.extensions.get('ttl_caches', {}).get(name)
+        if cache is not None:
+            cache.clear()
+
+
+def stable_digest(text):
+    """Short hex digest of text for cache keys.
+
+    Unlike hash(), which is salted per process, this is the same in every
+    worker and across restarts, so persisted cache entries keep matching.
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
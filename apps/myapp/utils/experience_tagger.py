@@ -195,7 +195,7 @@ class ExperienceTagger:
             tags.add('high-quality')
         
         # Multiple reviews suggest authenticity
-        review_count = venue.reviews.count() if venue.reviews else 0
+        review_count = len(venue.reviews) if venue.reviews else 0
         if review_count >= 5:
             tags.add('authentic')
         
@@ -1,11 +1,41 @@
 import requests
 import re
 import logging
+import threading
+from math import radians, cos, sin, asin, sqrt
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional, Tuple
 from models.review import ApiCache
+from utils.cache import get_app_cache, stable_digest
 
 logger = logging.getLogger(__name__)
 
+# US ZIP codes: 12345, 12345-6789 or 123456789
+ZIP_CODE_RE = re.compile(r'^\d{5}(?:-?\d{4})?$')
+NON_DIGIT_RE = re.compile(r'\D')
+
+# reverse_geocode() fields: Google component type -> which name to keep
+ADDRESS_COMPONENT_NAMES = {
+    'street_number': 'long_name',
+    'route': 'long_name',
+    'locality': 'long_name',
+    'administrative_area_level_1': 'short_name',
+    'postal_code': 'long_name',
+    'country': 'short_name',
+}
+
+# (connect, read) seconds; fail fast rather than hold a request for 30s
+REQUEST_TIMEOUT = (3.05, 10)
+
+# Statuses that will come back the same on retry; cached briefly so a bad
+# ZIP or address doesn't cost an API call on every request
+NEGATIVE_CACHE_STATUSES = frozenset({'ZERO_RESULTS', 'INVALID_REQUEST'})
+NEGATIVE_CACHE_HOURS = 1
+
+# How long a request waits for another thread already fetching the same key
+INFLIGHT_WAIT_SECONDS = 5
+
 class GeocodingService:
     """Service for converting ZIP codes and addresses to coordinates."""
     
@@ -14,29 +44,88 @@ class GeocodingService:
         self.google_api_key = google_api_key
         self.base_url = "https://maps.googleapis.com/maps/api/geocode/json"
         self.session = requests.Session()
+        # Keep enough pooled connections for concurrent workers and retry
+        # transient Google errors instead of failing the search outright
+        self.session.mount('https://', HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=64,
+            max_retries=Retry(total=3, backoff_factor=0.2,
+                              status_forcelist=[500, 502, 503, 504], allowed_methods=['GET'])
+        ))
+        # cache_key -> Event set once the thread fetching that key is done
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
     
     def _make_request(self, params: dict, cache_key: str = None) -> Optional[dict]:
-        """Make a request to the Google Geocoding API with caching."""
+        """Make a request to the Google Geocoding API with caching.
+        
+        Responses are kept in-process as well as in ApiCache, so repeat
+        lookups in the same worker skip the database read too. Concurrent
+        misses for the same key wait for a single API call.
+        """
+        memory_cache = get_app_cache('geocoding', 'LOCATION_CACHE_SECONDS')
+        
+        if not cache_key:
+            return self._fetch(params, cache_key, memory_cache)
+        
         # Check cache first
-        if cache_key:
-            cached_data = ApiCache.get_cached_data(cache_key)
+        cached_data = self._get_cached(cache_key, memory_cache)
+        if cached_data:
+            return cached_data
+        
+        with self._inflight_lock:
+            event = self._inflight.get(cache_key)
+            is_owner = event is None
+            if is_owner:
+                event = self._inflight[cache_key] = threading.Event()
+        
+        if not is_owner:
+            # Another thread is already asking Google; use its result
+            event.wait(timeout=INFLIGHT_WAIT_SECONDS)
+            cached_data = self._get_cached(cache_key, memory_cache)
             if cached_data:
-                logger.info(f"Using cached geocoding data for {cache_key}")
                 return cached_data
+            return self._fetch(params, cache_key, memory_cache)
         
+        try:
+            return self._fetch(params, cache_key, memory_cache)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[cache_key]
+            event.set()
+    
+    def _get_cached(self, cache_key: str, memory_cache) -> Optional[dict]:
+        """Look up a response in the in-process cache, then ApiCache."""
+        cached_data = memory_cache.get(cache_key)
+        if cached_data:
+            return cached_data
+        cached_data = ApiCache.get_cached_data(cache_key)
+        if cached_data:
+            logger.info(f"Using cached geocoding data for {cache_key}")
+            # Negative results keep their short ApiCache expiry
+            if cached_data.get('status') == 'OK':
+                memory_cache.set(cache_key, cached_data)
+        return cached_data
+    
+    def _fetch(self, params: dict, cache_key: Optional[str], memory_cache) -> Optional[dict]:
+        """Call the Geocoding API and cache a successful response."""
         # Add API key to parameters
         params['key'] = self.google_api_key
         
         try:
-            response = self.session.get(self.base_url, params=params, timeout=30)
+            response = self.session.get(self.base_url, params=params, timeout=REQUEST_TIMEOUT)
             response.raise_for_status()
             
             data = response.json()
             
             # Cache the response if cache_key provided and request was successful
-            if cache_key and data.get('status') == 'OK':
+            status = data.get('status')
+            if cache_key and status == 'OK':
                 # Cache geocoding data for 30 days since ZIP codes don't change
                 ApiCache.set_cached_data(cache_key, data, ttl_hours=720)
+                memory_cache.set(cache_key, data)
+            elif cache_key and status in NEGATIVE_CACHE_STATUSES:
+                ApiCache.set_cached_data(cache_key, data, ttl_hours=NEGATIVE_CACHE_HOURS)
             
             return data
             
@@ -55,16 +144,11 @@ class GeocodingService:
         # Remove any whitespace
         zip_code = zip_code.strip()
         
-        # US ZIP code patterns
-        # 5 digits: 12345
-        # 5+4 digits: 12345-6789
-        zip_patterns = [
-            r'^\d{5}$',           # 5 digits
-            r'^\d{5}-\d{4}$',     # 5+4 with dash
-            r'^\d{9}$'            # 9 digits without dash
-        ]
+        # Plain 5-digit ZIPs are almost every input; skip the regex for them
+        if len(zip_code) == 5 and zip_code.isascii() and zip_code.isdigit():
+            return True
         
-        return any(re.match(pattern, zip_code) for pattern in zip_patterns)
+        return ZIP_CODE_RE.match(zip_code) is not None
     
     def normalize_zip_code(self, zip_code: str) -> str:
         """Normalize ZIP code to standard 5-digit format."""
@@ -75,9 +159,9 @@ class GeocodingService:
         zip_code = str(zip_code).strip()
         
         # Extract just the first 5 digits
-        digits = re.findall(r'\d', zip_code)
+        digits = NON_DIGIT_RE.sub('', zip_code)
         if len(digits) >= 5:
-            return ''.join(digits[:5])
+            return digits[:5]
         
         return zip_code
     
@@ -125,7 +209,7 @@ class GeocodingService:
             return None
         
         address = address.strip()
-        cache_key = f"geocode_address_{hash(address)}"
+        cache_key = f"geocode_address_{stable_digest(address.lower())}"
         
         params = {
             'address': address
@@ -191,22 +275,11 @@ class GeocodingService:
         
         # Extract address components
         for component in address_components:
-            types = component.get('types', [])
-            long_name = component.get('long_name')
-            short_name = component.get('short_name')
-            
-            if 'street_number' in types:
-                address_info['street_number'] = long_name
-            elif 'route' in types:
-                address_info['route'] = long_name
-            elif 'locality' in types:
-                address_info['locality'] = long_name
-            elif 'administrative_area_level_1' in types:
-                address_info['administrative_area_level_1'] = short_name
-            elif 'postal_code' in types:
-                address_info['postal_code'] = long_name
-            elif 'country' in types:
-                address_info['country'] = short_name
+            for component_type in component.get('types', ()):
+                name_field = ADDRESS_COMPONENT_NAMES.get(component_type)
+                if name_field:
+                    address_info[component_type] = component.get(name_field)
+                    break
         
         return address_info
     
@@ -238,8 +311,6 @@ class GeocodingService:
     
     def calculate_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate distance between two points in miles using Haversine formula."""
-        from math import radians, cos, sin, asin, sqrt
-        
         # Convert decimal degrees to radians
         lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
         
@@ -314,7 +385,17 @@ class LocationService:
         return result
     
     def get_location_display_name(self, latitude: float, longitude: float) -> str:
-        """Get a human-readable location name for coordinates."""
+        """Get a human-readable location name for coordinates.
+        
+        Resolved names are cached in-process by coordinates rounded to 3
+        decimals (~100 m), which is finer than a city name changes.
+        """
+        cache = get_app_cache('locations', 'LOCATION_CACHE_SECONDS')
+        cache_key = ('name', round(latitude, 3), round(longitude, 3))
+        name = cache.get(cache_key)
+        if name:
+            return name
+        
         address_info = self.geocoding.reverse_geocode(latitude, longitude)
         
         if address_info:
@@ -322,11 +403,15 @@ class LocationService:
             state = address_info.get('administrative_area_level_1')
             
             if city and state:
-                return f"{city}, {state}"
+                name = f"{city}, {state}"
             elif city:
-                return city
+                name = city
             elif state:
-                return state
+                name = state
+            
+            if name:
+                cache.set(cache_key, name)
+                return name
         
         return f"{latitude:.4f}, {longitude:.4f}"
     
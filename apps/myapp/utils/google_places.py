@@ -1,9 +1,12 @@
 import requests
 import logging
 from typing import List, Dict, Optional, Tuple
-from models.review import ApiCache
+from sqlalchemy import and_, inspect, select
+from sqlalchemy.orm import joinedload, selectinload
+from models.review import ApiCache, UserFavorite, UserReview
 from models.venue import Venue, VenueCategory
 from models import db
+from utils.cache import get_app_cache, stable_digest
 
 logger = logging.getLogger(__name__)
 
@@ -174,7 +177,7 @@ class GooglePlacesAPI:
                 }
             }
 
-        cache_key = f"text_search_{hash(query)}_{location}_{radius}"
+        cache_key = f"text_search_{stable_digest(query)}_{location}_{radius}"
 
         data = self._post('places:searchText', body, _SEARCH_FIELD_MASK, cache_key)
 
@@ -380,7 +383,7 @@ class GooglePlacesAPI:
                 self.accessible_seating = accessibility_info.get('accessible_seating', False)
 
                 # Mock reviews for analysis
-                self.reviews = type('MockRelation', (), {'count': lambda self: 0})()
+                self.reviews = []
 
         # Extract accessibility info first (needed for temp venue)
         accessibility_info = self.extract_accessibility_info(place_data)
@@ -516,7 +519,17 @@ class VenueSearchService:
 
     def search_venues(self, latitude: float, longitude: float, radius_miles: int = 30,
                      category_id: int = None, wheelchair_accessible_only: bool = False) -> List[Venue]:
-        """Search for venues and return Venue objects."""
+        """Search for venues and return Venue objects.
+
+        The resulting venue ids are cached briefly per search, so a repeated
+        search is one primary-key fetch instead of a Places lookup and sync.
+        """
+        results_cache = get_app_cache('venue_searches', 'SEARCH_RESULTS_CACHE_SECONDS')
+        cache_key = (latitude, longitude, radius_miles, category_id, bool(wheelchair_accessible_only))
+        venue_ids = results_cache.get(cache_key)
+        if venue_ids is not None:
+            return self._load_cached_venues(venue_ids, latitude, longitude)
+
         radius_meters = int(radius_miles * 1609.34)  # Convert miles to meters
 
         # Get category if specified
@@ -533,20 +546,43 @@ class VenueSearchService:
         else:
             places_data = self.google_api.search_nearby(latitude, longitude, radius_meters)
 
-        venues = []
-        for place_data in places_data:
+        # Look up every already-known place in one query (with its category)
+        # instead of one find_by_google_place_id() round trip per result.
+        place_ids = [place_data.get('id') for place_data in places_data if place_data.get('id')]
+        existing_venues = {
+            venue.google_place_id: venue
+            for venue in Venue.query.options(joinedload(Venue.category), selectinload(Venue.reviews))
+                                    .filter(Venue.google_place_id.in_(place_ids)).all()
+        } if place_ids else {}
+
+        # Handle already-known places before new ones. Every commit (for a new
+        # or refreshed venue) expires the whole session, and touching known
+        # venues after that would refresh them one query at a time.
+        processed = [None] * len(places_data)
+        order = sorted(range(len(places_data)),
+                       key=lambda index: places_data[index].get('id') not in existing_venues)
+        for index in order:
             try:
-                venue = self._process_place_data(place_data, category_id)
-                if venue:
-                    # Filter by accessibility if requested
-                    if wheelchair_accessible_only and not venue.wheelchair_accessible:
-                        continue
-                    venues.append(venue)
+                processed[index] = self._process_place_data(places_data[index], category_id, existing_venues)
             except Exception as e:
                 logger.error(f"Error processing place data: {e}")
                 continue
+        venues = [venue for venue in processed if venue]
+
+        # Reload whatever those commits expired in one pass, with the
+        # relationships the results are serialized with
+        expired_ids = [inspect(venue).identity[0] for venue in venues if inspect(venue).expired]
+        if expired_ids:
+            Venue.query.options(joinedload(Venue.category), selectinload(Venue.reviews))\
+                       .filter(Venue.id.in_(expired_ids)).populate_existing().all()
+
+        # Filter by accessibility if requested
+        if wheelchair_accessible_only:
+            venues = [venue for venue in venues if venue.wheelchair_accessible]
 
         # Sort by interestingness first, then by distance
+        Venue.preload_distances(venues, latitude, longitude)
+
         def sort_key(venue):
             distance = venue.distance_from(latitude, longitude) or float('inf')
             interestingness = float(venue.interestingness_score) if venue.interestingness_score else 0.0
@@ -558,16 +594,34 @@ class VenueSearchService:
 
         venues.sort(key=sort_key)
 
+        results_cache.set(cache_key, [venue.id for venue in venues])
+        return venues
+
+    def _load_cached_venues(self, venue_ids: List[int], latitude: float, longitude: float) -> List[Venue]:
+        """Load a cached search result in its original order."""
+        if not venue_ids:
+            return []
+        venues_by_id = {
+            venue.id: venue
+            for venue in Venue.query.options(joinedload(Venue.category), selectinload(Venue.reviews))
+                                    .filter(Venue.id.in_(venue_ids)).all()
+        }
+        venues = [venues_by_id[venue_id] for venue_id in venue_ids if venue_id in venues_by_id]
+        Venue.preload_distances(venues, latitude, longitude)
         return venues
 
-    def _process_place_data(self, place_data: Dict, category_id: int = None) -> Optional[Venue]:
+    def _process_place_data(self, place_data: Dict, category_id: int = None,
+                            existing_venues: Dict[str, Venue] = None) -> Optional[Venue]:
         """Process Google Places data and create/update venue."""
         place_id = place_data.get('id')
         if not place_id:
             return None
 
         # Check if venue already exists
-        existing_venue = Venue.find_by_google_place_id(place_id)
+        if existing_venues is not None:
+            existing_venue = existing_venues.get(place_id)
+        else:
+            existing_venue = Venue.find_by_google_place_id(place_id)
 
         if existing_venue:
             # Update existing venue if it's old
@@ -600,20 +654,37 @@ class VenueSearchService:
         # Calculate and set interestingness score after venue is created
         venue.update_interestingness_score()
 
+        # Read these before the commit expires the instance
+        created_message = f"Created new venue: {venue.name} (interestingness: {venue.interestingness_score})"
         try:
             db.session.commit()
-            logger.info(f"Created new venue: {venue.name} (interestingness: {venue.interestingness_score})")
+            logger.info(created_message)
             return venue
         except Exception as e:
             db.session.rollback()
             logger.error(f"Failed to create venue: {e}")
             return None
 
-    def get_venue_details(self, venue_id: int) -> Optional[Venue]:
-        """Get detailed venue information."""
-        venue = Venue.query.get(venue_id)
-        if not venue:
+    def get_venue_details(self, venue_id: int, user_id: Optional[int] = None) -> Optional[Dict]:
+        """Get detailed venue information plus the user's favorite/review state.
+
+        The venue, its category, its reviews (with authors) and whether
+        user_id has favorited it are loaded together instead of one query each.
+        """
+        stmt = select(Venue).options(
+            joinedload(Venue.category),
+            selectinload(Venue.reviews).joinedload(UserReview.user)
+        ).where(Venue.id == venue_id)
+        if user_id:
+            stmt = stmt.add_columns(UserFavorite.id).outerjoin(
+                UserFavorite,
+                and_(UserFavorite.venue_id == Venue.id, UserFavorite.user_id == user_id)
+            )
+        row = db.session.execute(stmt).first()
+        if not row:
             return None
+        venue = row[0]
+        is_favorited = bool(user_id) and row[1] is not None
 
         # Refresh data if it's old
         from datetime import datetime, timedelta
@@ -628,4 +699,12 @@ class VenueSearchService:
                     venue.last_updated = datetime.utcnow()
                     db.session.commit()
 
-        return venue
+        reviews = sorted(venue.reviews, key=lambda r: r.created_at, reverse=True)
+        user_review = next((r for r in reviews if user_id and r.user_id == user_id), None)
+
+        return {
+            'venue': venue,
+            'is_favorited': is_favorited,
+            'user_review': user_review,
+            'recent_reviews': reviews[:5]
+        }